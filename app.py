@@ -1,7 +1,27 @@
-import json
+import io
+import sys
+import asyncio
+import orjson
 from pathlib import Path  # required for handling paths
+import fyersModel
 import instances  # required to load telegram instance and Fyers instance
 
+
+async def fetch_dashboard(Fyers):
+    # independent GETs to the same host, issued concurrently
+    try:
+        return await asyncio.gather(
+            Fyers.aget_profile(),
+            Fyers.atradebook(),
+            Fyers.afunds(),
+            Fyers.aholdings(),
+            Fyers.aorderbook(),
+            Fyers.apositions(),
+        )
+    finally:
+        await fyersModel.aclient.aclose()
+
+
 if __name__ == "__main__":
     # set root/ parent directories
     root = Path.cwd()
@@ -11,5 +31,13 @@ if __name__ == "__main__":
     Path.mkdir(logdir, exist_ok=True)
 
     telegramBot, Fyers = instances.get_instance(logdir)
-    json_str = lambda x: json.dumps(x, indent=4, default=str)
-    print(json_str(Fyers.holdings))
+    json_str = lambda x: orjson.dumps(
+        x, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+    # format every response into one buffer and write it out once
+    buffer = io.StringIO()
+    names = ("profile", "tradebook", "funds", "holdings", "orderbook", "positions")
+    for name, response in zip(names, asyncio.run(fetch_dashboard(Fyers))):
+        buffer.write(f"--- {name} ---\n{json_str(response)}\n")
+    sys.stdout.write(buffer.getvalue())
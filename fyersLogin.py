@@ -1,11 +1,22 @@
 import os
+import json
+import datetime
+import concurrent.futures
+import httpx
 import pyotp
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import unquote
 import utils as utils
 
 import fyersModel
 
-client = utils.RestClient()  # Create an instance of the RestClient
+# the shared pooled client, which fyersModel also uses, so the token exchange reuses the connections opened while logging in
+client = utils.client
+
+# Runs logins in the background so constructing a FyersLogin does not block
+login_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+# Fyers access tokens expire at the end of the Indian trading day
+IST = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
 
 
 class FyersCredentials:
@@ -29,7 +40,6 @@ class FyersLogin(FyersCredentials, utils.ExceptionLogger):
 
         This constructor sets up the necessary URLs, endpoints, and initializes variables for API responses.
         """
-        FyersCredentials.__init__(self)
         utils.ExceptionLogger.__init__(self, level="DEBUG", log_path=log_path)
         # URLs
         self.loginAPI = "https://api-t2.fyers.in/vagator/v2"
@@ -43,28 +53,88 @@ class FyersLogin(FyersCredentials, utils.ExceptionLogger):
 
         # API response data
         self.data = {}
-        self.access_token = None
+        self._access_token = None
 
         # Log Path
         self.log_path = log_path
         os.makedirs(self.log_path, exist_ok=True)
 
-        # set bot
+        # set bot, and bind the message sink once: the bot if available, stdout otherwise
         self.teleBot = teleBot
-        # print
+        self.sendMessage = teleBot.sendMessage if teleBot else print
 
         # Client ID
         self.client_id = f"{self.app_id}-{self.app_type}"
 
-        # login
+        # login in the background; access_token and __call__ wait for it to finish
+        self._login_future = login_executor.submit(self._authenticate)
+
+    @property
+    def access_token(self):
+        """
+        The Fyers access token, waiting for the background login to complete if necessary.
+        """
+        self._login_future.result()
+        return self._access_token
+
+    def _authenticate(self):
+        """
+        Logs in, unless today's cached access token is still valid.
+        """
+        if not self.log_exception(self._load_cached_token)():
+            self.log_exception(self.login)()
+
+    @property
+    def _token_path(self):
+        return os.path.join(self.log_path, ".fyers_token.json")
+
+    def _save_token(self):
+        """
+        Writes the access token and its issue time to the token cache file.
+        """
+        # create the file owner-only, so the token is never readable by others, even briefly
+        fd = os.open(self._token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.fchmod(fd, 0o600)  # a file left by an older version may still be world-readable
+        with os.fdopen(fd, "w") as file:
+            json.dump(
+                {"token": self._access_token, "issued_at": datetime.datetime.now(IST).isoformat()},
+                file,
+            )
+
+    def _load_cached_token(self):
+        """
+        Loads the access token from the token cache file if it was issued on the current trading day.
+
+        Returns:
+            bool: True if a valid cached token was loaded, False otherwise.
+        """
+        try:
+            with open(self._token_path, "r") as file:
+                cached = json.load(file)
+        except FileNotFoundError:
+            return False
+
+        issued_at = datetime.datetime.fromisoformat(cached["issued_at"])
+        if issued_at.astimezone(IST).date() != datetime.datetime.now(IST).date():
+            return False
+
+        self._access_token = cached["token"]
+        return self._is_token_valid()
 
-        self.log_exception(self.login)()
+    def _is_token_valid(self):
+        """
+        Probes the profile endpoint with the current access token.
 
-    def sendMessage(self, message):
-        if self.teleBot:
-            self.teleBot.sendMessage(message)
-        else:
-            print(message)
+        Returns:
+            bool: False if the token is rejected by the Fyers API, True otherwise.
+        """
+        try:
+            response = self._fyers_model().get_profile()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                return False
+            raise
+        return response.get("s") == "ok"
 
     @client.request
     def _send_loginOTP(self):
@@ -163,11 +233,17 @@ class FyersLogin(FyersCredentials, utils.ExceptionLogger):
         url = self.data.get("Url")
         response = None
         if url:
-            parsed = urlparse(url)
-            auth_code = parse_qs(parsed.query)["auth_code"][0]
+            # pick auth_code straight out of the query string; no need to parse the whole URL
+            query = url.partition("?")[2]
+            params = (param.partition("=") for param in query.split("&"))
+            auth_code = next((unquote(value) for key, _, value in params if key == "auth_code"), None)
+            if auth_code is None:
+                raise KeyError(f"auth_code not found in redirect URL: {url}")
             appSession.set_token(auth_code)
             response = appSession.generate_token()
-            self.access_token = response.get("access_token")
+            self._access_token = response.get("access_token")
+            if self._access_token:
+                self._save_token()
 
         return response
 
@@ -176,7 +252,13 @@ class FyersLogin(FyersCredentials, utils.ExceptionLogger):
         if self.data.get("message"):
             self.sendMessage(f"{step_name} successful: {self.data['message']}")
 
-    @utils.retry(max_attempts=3, initial_delay=3, backoff_factor=2)
+    @utils.retry(
+        max_attempts=3,
+        initial_delay=0.5,
+        backoff_factor=2,
+        should_retry=utils.is_transient_http_error,
+        jitter=0.5,
+    )
     def login(self):
         """
         Performs the Fyers login process, including sending OTP, verifying TOTP, verifying PIN, generating an Auth Code, and generating an Access Token.
@@ -195,12 +277,16 @@ class FyersLogin(FyersCredentials, utils.ExceptionLogger):
         self.sendMessage("Login successful!")
         return True
 
-    def __call__(self):
+    def _fyers_model(self):
         return fyersModel.FyersModel(
             client_id=self.client_id,
-            token=self.access_token,
+            token=self._access_token,
         )
 
+    def __call__(self):
+        self._login_future.result()
+        return self._fyers_model()
+
 
 if __name__ == "__main__":
     fyers = FyersLogin(log_path=f"{os.getcwd()}/log")
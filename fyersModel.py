@@ -1,17 +1,45 @@
+import asyncio
 import datetime
+import inspect
+import os
+import tempfile
+import time
+from pathlib import Path
 from fyers_apiv3 import fyersModel
+import numpy as np
 import pandas as pd
 import utils
-import concurrent.futures
-import functools
 
 
-# initiate async rest client
-client = utils.RestClient()
+# the shared rest clients
+client = utils.client
+aclient = utils.aclient
+
+# Retry policy for history requests; jitter (seconds) spreads out retries of concurrent chunks.
+# Fixed when the module is imported: they are bound into the retry decorators of FyersModel.history
+HISTORY_MAX_ATTEMPTS = 5
+HISTORY_RETRY_JITTER = 0.4
 
 
 class SessionModel(fyersModel.SessionModel):
-    pass
+    @client.request
+    def generate_token(self) -> dict:
+        """
+        Exchanges the auth code for an access token over the shared pooled client, which
+        fyersLogin also sends its login steps through.
+
+        Returns:
+            The response JSON as a dictionary.
+        """
+        return {
+            "method": "POST",
+            "url": f"{Config.API}{Config.generate_access_token}",
+            "json": {
+                "grant_type": self.grant_type,
+                "appIdHash": self.get_hash().hexdigest(),
+                "code": self.auth_token,
+            },
+        }
 
 
 class Config(fyersModel.Config):
@@ -19,15 +47,38 @@ class Config(fyersModel.Config):
 
 
 class FyersModel:
-    def __init__(self, client_id: str, token: str):
+    # Endpoint URLs, composed once at class definition
+    _URL_PROFILE = f"{Config.API}{Config.get_profile}"
+    _URL_TRADEBOOK = f"{Config.API}{Config.tradebook}"
+    _URL_FUNDS = f"{Config.API}{Config.funds}"
+    _URL_POSITIONS = f"{Config.API}{Config.positions}"
+    _URL_HOLDINGS = f"{Config.API}{Config.holdings}"
+    _URL_ORDERBOOK = f"{Config.API}{Config.orderbook}"
+    _URL_CONVERT_POSITION = f"{Config.API}{Config.convert_position}"
+    _URL_ORDERS = f"{Config.API}{Config.orders_endpoint}"
+    _URL_MULTI_ORDERS = f"{Config.API}{Config.multi_orders}"
+    _URL_MARKET_STATUS = f"{Config.DATA_API}{Config.market_status}"
+    _URL_HISTORY = f"{Config.DATA_API}{Config.history}"
+    _URL_QUOTES = f"{Config.DATA_API}{Config.quotes}"
+    _URL_DEPTH = f"{Config.DATA_API}{Config.market_depth}"
+
+    # Maximum age in seconds of the cached orderbook used by get_orders
+    ORDERBOOK_TTL = 1.0
+
+    # Cached history chunks older than this many days are deleted, bounding the cache's size
+    HISTORY_CACHE_MAX_AGE_DAYS = 30
+
+    def __init__(self, client_id: str, token: str, cache_dir: str = "cache"):
         """
         Initializes an instance of FyersModelv3.
 
         Args:
             client_id: The client ID for API authentication.
             token: The token for API authentication.
+            cache_dir: Directory for the on-disk history cache. Defaults to 'cache'.
 
         """
+        self.cache_dir = Path(cache_dir)
         self.client_id = client_id
         self.access_token = token
         self.header = f"{self.client_id}:{self.access_token}"
@@ -38,6 +89,53 @@ class FyersModel:
             "version": "3",
         }
 
+        # Per-endpoint request templates, built once so each call only adds its method and params/data
+        template = lambda url: {"headers": self.headers, "url": url}
+        self._tmpl_profile = template(self._URL_PROFILE)
+        self._tmpl_tradebook = template(self._URL_TRADEBOOK)
+        self._tmpl_funds = template(self._URL_FUNDS)
+        self._tmpl_positions = template(self._URL_POSITIONS)
+        self._tmpl_holdings = template(self._URL_HOLDINGS)
+        self._tmpl_orderbook = template(self._URL_ORDERBOOK)
+        self._tmpl_convert_position = template(self._URL_CONVERT_POSITION)
+        self._tmpl_orders = template(self._URL_ORDERS)
+        self._tmpl_multi_orders = template(self._URL_MULTI_ORDERS)
+        self._tmpl_market_status = template(self._URL_MARKET_STATUS)
+        self._tmpl_history = template(self._URL_HISTORY)
+        self._tmpl_quotes = template(self._URL_QUOTES)
+        self._tmpl_depth = template(self._URL_DEPTH)
+
+        # Orderbook indexed by order ID, refreshed by get_orders at most every ORDERBOOK_TTL seconds
+        self._ob_response = None
+        self._ob_index = None
+        self._ob_ts = 0.0
+
+        # the history cache is pruned once per instance, before its first write
+        self._history_cache_pruned = False
+
+    def __getstate__(self):
+        # only the credentials are pickled; request templates and caches are rebuilt on load
+        return {"client_id": self.client_id, "token": self.access_token, "cache_dir": str(self.cache_dir)}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def keep_alive(self, interval=25):
+        """
+        Keeps the pooled connection to the Fyers API warm, so the first order after an idle
+        period does not pay for a fresh TCP/TLS handshake.
+
+        Calling it again, e.g. from a reloaded instance, replaces the running pinger rather than
+        starting a second one.
+
+        Args:
+            interval (float, optional): Seconds between pings. Defaults to 25 seconds.
+
+        Returns:
+            threading.Event: Set it to stop the pings.
+        """
+        return client.keep_alive(**self._tmpl_profile, interval=interval)
+
     @client.request
     def get_profile(self) -> dict:
         """
@@ -46,12 +144,7 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.get_profile}",
-            "params": None,
-        }
+        return {"method": "GET", **self._tmpl_profile}
 
     @client.request
     def tradebook(self) -> dict:
@@ -61,12 +154,7 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.tradebook}",
-            "params": None,
-        }
+        return {"method": "GET", **self._tmpl_tradebook}
 
     @client.request
     def funds(self) -> dict:
@@ -76,12 +164,7 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.funds}",
-            "params": None,
-        }
+        return {"method": "GET", **self._tmpl_funds}
 
     @client.request
     def positions(self) -> dict:
@@ -91,12 +174,7 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.positions}",
-            "params": None,
-        }
+        return {"method": "GET", **self._tmpl_positions}
 
     @property
     @client.request
@@ -107,45 +185,63 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.holdings}",
-            "params": None,
-        }
+        return {"method": "GET", **self._tmpl_holdings}
 
     @client.request
-    def orderbook(self) -> dict:
+    def orderbook(self, data=None) -> dict:
         """
         Retrieves order details by ID.
 
+        Args:
+            data (dict, optional): Query parameters, e.g. {"id": "<comma-separated order IDs>"}. If not
+                provided, the full orderbook is returned.
+
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.orderbook}",
-            "params": None,
-        }
+        return {"method": "GET", **self._tmpl_orderbook, "params": data}
+
+    # Async variants of the account endpoints, sharing the request inputs of the sync methods
+    aget_profile = aclient.request(get_profile.__wrapped__)
+    atradebook = aclient.request(tradebook.__wrapped__)
+    afunds = aclient.request(funds.__wrapped__)
+    apositions = aclient.request(positions.__wrapped__)
+    aholdings = aclient.request(holdings.fget.__wrapped__)
+    aorderbook = aclient.request(orderbook.__wrapped__)
+
+    def _orderbook_index(self) -> dict:
+        """
+        Retrieves the orderbook indexed by order ID, reusing the cached copy while it is fresh.
+
+        Returns:
+            A dictionary mapping order IDs to orders.
+        """
+        now = time.monotonic()
+        if self._ob_index is None or now - self._ob_ts > self.ORDERBOOK_TTL:
+            self._ob_response = self.orderbook()
+            self._ob_index = {order["id"]: order for order in self._ob_response["orderBook"]}
+            self._ob_ts = now
+        return self._ob_index
 
     def get_orders(self, data) -> dict:
         """
         Retrieves order details by ID.
 
+        The orderbook is fetched at most once every ``ORDERBOOK_TTL`` seconds and indexed by ID,
+        so polling the status of several orders costs a single request. Placing, modifying or
+        cancelling an order invalidates the cache.
+
         Args:
             data: The data containing the order ID.
 
         Returns:
             The response JSON as a dictionary.
         """
-        id_list = data.get("id").split(",")
-        response = self.orderbook()
-        response["orderBook"] = [
-            order for order in response["orderBook"] if order["id"] in id_list
-        ]
-
-        return response
+        index = self._orderbook_index()
+        return {
+            **self._ob_response,
+            "orderBook": [index[order_id] for order_id in data.get("id").split(",") if order_id in index],
+        }
 
     @client.request
     def market_status(self) -> dict:
@@ -155,12 +251,7 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.DATA_API}{Config.market_status}",
-            "params": None,
-        }
+        return {"method": "GET", **self._tmpl_market_status}
 
     @client.request
     def convert_position(self, data) -> dict:
@@ -177,12 +268,7 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "POST",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.convert_position}",
-            "data": data,
-        }
+        return {"method": "POST", **self._tmpl_convert_position, "json": data}
 
     @client.request
     def cancel_order(self, data) -> dict:
@@ -196,12 +282,8 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "DELETE",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.orders_endpoint}",
-            "params": data,
-        }
+        self._ob_index = None  # orders are changing, refetch on the next get_orders
+        return {"method": "DELETE", **self._tmpl_orders, "params": data}
 
     @client.request
     def place_order(self, data) -> dict:
@@ -226,12 +308,8 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "POST",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.orders_endpoint}",
-            "data": data,
-        }
+        self._ob_index = None  # orders are changing, refetch on the next get_orders
+        return {"method": "POST", **self._tmpl_orders, "json": data}
 
     @client.request
     def modify_order(self, data) -> dict:
@@ -248,12 +326,8 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "PATCH",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.orders_endpoint}",
-            "data": data,
-        }
+        self._ob_index = None  # orders are changing, refetch on the next get_orders
+        return {"method": "PATCH", **self._tmpl_orders, "json": data}
 
     @client.request
     def exit_positions(self, data=None) -> dict:
@@ -270,12 +344,8 @@ class FyersModel:
         if not data:
             data = {"exit_all": 1}
 
-        return {
-            "method": "DELETE",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.orders_endpoint}",
-            "data": data,
-        }
+        self._ob_index = None  # orders are changing, refetch on the next get_orders
+        return {"method": "DELETE", **self._tmpl_orders, "json": data}
 
     @client.request
     def cancel_basket_orders(self, data):
@@ -288,12 +358,8 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "DELETE",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.multi_orders}",
-            "data": data,
-        }
+        self._ob_index = None  # orders are changing, refetch on the next get_orders
+        return {"method": "DELETE", **self._tmpl_multi_orders, "json": data}
 
     @client.request
     def place_basket_orders(self, data):
@@ -320,12 +386,10 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "POST",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.multi_orders}",
-            "data": data,
-        }
+        self._ob_index = None  # orders are changing, refetch on the next get_orders
+        return {"method": "POST", **self._tmpl_multi_orders, "json": data}
+
+    aplace_basket_orders = aclient.request(place_basket_orders.__wrapped__)
 
     @client.request
     def modify_basket_orders(self, data):
@@ -344,14 +408,18 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "PATCH",
-            "headers": self.headers,
-            "url": f"{Config.API}{Config.multi_orders}",
-            "data": data,
-        }
-
-    @utils.retry(max_attempts=5, initial_delay=2, backoff_factor=2, do_print=False)
+        self._ob_index = None  # orders are changing, refetch on the next get_orders
+        return {"method": "PATCH", **self._tmpl_multi_orders, "json": data}
+
+    @utils.retry(
+        max_attempts=HISTORY_MAX_ATTEMPTS,
+        initial_delay=2,
+        backoff_factor=2,
+        do_print=False,
+        should_retry=utils.is_transient_http_error,
+        jitter=HISTORY_RETRY_JITTER,
+        max_delay=10,
+    )
     @client.request
     def history(self, data: dict):
         """
@@ -375,12 +443,17 @@ class FyersModel:
 
         request_data = {"date_format": "1", "cont_flag": "1"}
         data = {**request_data, **data}
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.DATA_API}{Config.history}",
-            "params": data,
-        }
+        return {"method": "GET", **self._tmpl_history, "params": data}
+
+    ahistory = utils.aretry(
+        max_attempts=HISTORY_MAX_ATTEMPTS,
+        initial_delay=2,
+        backoff_factor=2,
+        do_print=False,
+        should_retry=utils.is_transient_http_error,
+        jitter=HISTORY_RETRY_JITTER,
+        max_delay=10,
+    )(aclient.request(inspect.unwrap(history)))
 
     @client.request
     def quotes(self, data=None):
@@ -393,12 +466,7 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.DATA_API}{Config.quotes}",
-            "params": data,
-        }
+        return {"method": "GET", **self._tmpl_quotes, "params": data}
 
     @client.request
     def depth(self, data=None):
@@ -412,73 +480,126 @@ class FyersModel:
         Returns:
             The response JSON as a dictionary.
         """
-        return {
-            "method": "GET",
-            "headers": self.headers,
-            "url": f"{Config.DATA_API}{Config.market_depth}",
-            "params": data,
-        }
+        return {"method": "GET", **self._tmpl_depth, "params": data}
 
     def validate_date_range(self, data):
-        # convert date
-        day_difference = (data.get("range_to") - data.get("range_from")).days
+        range_from, range_to = data["range_from"], data["range_to"]
 
         # allowed date deference || 365 days for daily timeframe and 100 days for other timeframe
-        allowed_day_difference = {"D": 365}.get(data.get("resolution", 100))
-
-        interval = day_difference // allowed_day_difference
-        current_date = data.get("range_from")
-
-        # create a new list of input data
-        data_list = [] * interval
-        while current_date <= data.get("range_to"):
-            temp_dict = dict(range_from=current_date)
-            current_date += datetime.timedelta(days=allowed_day_difference)
-            temp_dict["range_to"] = (
-                current_date - datetime.timedelta(days=1)
-                if current_date <= data.get("range_to")
-                else data.get("range_to")
-            )
-            data_list.append({**data, **temp_dict})
-        return data_list
+        window = datetime.timedelta(days={"D": 365}.get(data.get("resolution"), 100))
+        last_day = window - datetime.timedelta(days=1)
+
+        # split the range into consecutive windows, the last one ending at range_to
+        starts = (range_from + i * window for i in range((range_to - range_from).days // window.days + 1))
+        return [{**data, "range_from": start, "range_to": min(start + last_day, range_to)} for start in starts]
 
     def convert_to_OHLCV(self, data, response):
         columns = ["date", "open", "high", "low", "close", "volume"]
-        df = pd.DataFrame(response["candles"], columns=columns)
+        # One contiguous float64 array instead of pandas inferring types cell by cell
+        candles = np.asarray(response["candles"], dtype=np.float64).reshape(-1, len(columns))
 
-        # Convert 'date' to datetime and set it as the index
-        df["timestamp"] = pd.to_datetime(df["date"], unit="s") + datetime.timedelta(
-            hours=5, minutes=30
-        )
-        df["date"] = df["timestamp"].dt.date
-        df["time"] = df["timestamp"].dt.time
-        df = df.set_index("timestamp")
+        # Convert the epoch 'date' to an IST timestamp index; callers derive calendar
+        # dates/times from the index only when they need them
+        timestamp = pd.to_datetime(candles[:, 0].astype("int64"), unit="s", utc=True).tz_convert("Asia/Kolkata")
+        df = pd.DataFrame(candles[:, 1:], columns=columns[1:], index=timestamp.rename("timestamp"))
 
-        # Add 'symbol' column and return selected columns
+        # Add 'symbol' column
         df["symbol"] = data.get("symbol")
-        return df[
-            ["date", "time", "open", "high", "low", "close", "volume", "symbol"]
-        ]
+        return df
+
+    def _history_cache_path(self, data) -> Path:
+        symbol = data.get("symbol").replace(":", "_")
+        return self.cache_dir / f"{symbol}_{data.get('resolution')}_{data.get('range_from')}_{data.get('range_to')}.parquet"
+
+    def _read_history_cache(self, data):
+        """
+        Reads the candles of a history chunk from the disk cache.
+
+        Only a chunk written on a later day than its ``range_to`` is served: it holds complete
+        candles and never expires. One written on or before that day may end in a partial candle,
+        so it is always fetched again.
+
+        Returns:
+            A response-like dictionary holding the cached candles, or None on a cache miss.
+        """
+        path = self._history_cache_path(data)
+        try:
+            modification_time = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+        if datetime.date.fromtimestamp(modification_time) <= data.get("range_to"):
+            return None
+        return {"candles": pd.read_parquet(path)}
+
+    def prune_history_cache(self):
+        """
+        Deletes cached history chunks written more than ``HISTORY_CACHE_MAX_AGE_DAYS`` days ago.
+
+        Every (symbol, resolution, range) fetched adds a file, so without pruning the cache grows
+        without bound. A pruned chunk that is still needed is fetched again on its next use.
+        """
+        cutoff = time.time() - self.HISTORY_CACHE_MAX_AGE_DAYS * 24 * 60 * 60
+        # match only history chunk files, leaving other caches sharing the directory alone
+        for path in self.cache_dir.glob("*_????-??-??_????-??-??.parquet"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _write_history_cache(self, data, response):
+        # a chunk reaching today may end in a partial candle and would never be served
+        if "candles" not in response or data.get("range_to") >= datetime.date.today():
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if not self._history_cache_pruned:
+            self.prune_history_cache()
+            self._history_cache_pruned = True
+        candles = pd.DataFrame(response["candles"], columns=["date", "open", "high", "low", "close", "volume"])
+
+        # several fetch threads write here: write a private temp file and rename it into place, so
+        # readers never see a partly written chunk
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as tmp:
+            tmp_path = tmp.name
+        try:
+            candles.to_parquet(tmp_path, compression="zstd", index=False)
+            os.replace(tmp_path, self._history_cache_path(data))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    async def _gather_history(self, data_list):
+        return await asyncio.gather(*(self.ahistory(data) for data in data_list))
+
+    # blocking variant on the shared background loop, so it also works when the caller is itself
+    # running an event loop, and the loop's pooled client is kept across calls
+    _fetch_history_chunks = aclient.async_run(_gather_history)
 
-    @utils.freezeargs
-    @functools.lru_cache(maxsize=100)
     def get_history(self, data: dict):
         data_list = self.validate_date_range(data)
 
-        # Get history
-        with concurrent.futures.ThreadPoolExecutor(5) as executor:
-            responses = list(executor.map(self.history, data_list))
-
-        ohlcv_data = pd.concat(
-            [
-                self.convert_to_OHLCV(data, response)
-                for data, response in zip(data_list, responses)
-            ]
+        # Serve chunks from the disk cache and fetch only the missing ones: a single chunk goes
+        # straight over the persistent sync client, several are fetched concurrently
+        responses = [self._read_history_cache(chunk) for chunk in data_list]
+        missing = [i for i, response in enumerate(responses) if response is None]
+        if len(missing) == 1:
+            fetched = [self.history(data_list[missing[0]])]
+        elif missing:
+            fetched = self._fetch_history_chunks([data_list[i] for i in missing])
+        else:
+            fetched = []
+
+        for i, response in zip(missing, fetched):
+            self._write_history_cache(data_list[i], response)
+            responses[i] = response
+
+        # Merge the raw candles of every chunk and build a single DataFrame from them
+        candles = np.concatenate(
+            [np.asarray(response["candles"], dtype=np.float64).reshape(-1, 6) for response in responses]
         )
-        return ohlcv_data
+        return self.convert_to_OHLCV(data, {"candles": candles})
 
-    @utils.freezeargs
-    @functools.lru_cache(maxsize=100)
     def history_daily(self, data):
         """
         Fetch and process daily historical data using the Fyers API.
@@ -493,26 +614,105 @@ class FyersModel:
         # Fetch historical data using the Fyers API
         historical_data = self.get_history(data=data)
 
-        # Reset and set the "date" column as the index
-        historical_data = historical_data.reset_index().set_index("date")
+        # Index by the IST calendar date of each candle
+        historical_data.index = historical_data.index.tz_localize(None).normalize()
 
         # Remove duplicate index values, keeping the first occurrence
         historical_data = historical_data[
             ~historical_data.index.duplicated(keep="first")
         ]
 
-        # Create a date range based on specified start and end dates
-        date_range = pd.date_range(
-            start=pd.to_datetime(data.get("range_from")),
-            end=pd.to_datetime(data.get("range_to")),
-            freq="D",
-        )
-
-        # Reindex the historical data to match the date range, forward fill missing data, and drop NaN values
-        historical_data = historical_data.reindex(date_range).ffill().dropna()
+        # Keep only the trading days within the requested range; weekends and holidays are not filled in
+        historical_data = historical_data.loc[
+            pd.to_datetime(data.get("range_from")) : pd.to_datetime(data.get("range_to"))
+        ]
         historical_data.index.name = "date"
 
-        # Remove the "timestamp" and "time" columns
-        historical_data = historical_data.drop(columns=["timestamp", "time"])
-
         return historical_data.reset_index()
+
+
+class OrderBatcher:
+    """
+    Coalesces single orders submitted within a short window into basket orders.
+
+    Queued orders are sent as one ``place_basket_orders`` request once ``max_size`` orders
+    are waiting or ``max_wait_ms`` has passed since the first of them was queued.
+    """
+
+    def __init__(self, fyers: FyersModel, max_wait_ms: float = 50, max_size: int = 10):
+        """
+        Initializes an instance of OrderBatcher.
+
+        Args:
+            fyers: The FyersModel used to place the basket orders.
+            max_wait_ms: Maximum time in milliseconds an order waits for a batch. Defaults to 50.
+            max_size: Maximum number of orders per basket. Fyers accepts up to 10. Defaults to 10.
+        """
+        self._fyers = fyers
+        self.max_wait = max_wait_ms / 1000
+        self.max_size = max_size
+        self._queue = []
+        self._timer = None
+        self._sending = set()  # basket tasks in flight, referenced so they are not garbage collected
+
+    async def submit(self, order: dict) -> dict:
+        """
+        Queues an order for the next basket and waits for its result.
+
+        Args:
+            order: The order details, as accepted by ``FyersModel.place_order``.
+
+        Returns:
+            The basket response entry for this order.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((order, future))
+        if len(self._queue) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        self._flush()
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._queue = self._queue, []
+        if not batch:
+            return
+
+        # send the basket in its own task: cancelling the submitter that filled it (e.g. with
+        # asyncio.wait_for) must not cancel a request the other orders are waiting on
+        task = asyncio.create_task(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch):
+        error = None
+        try:
+            response = await self._fyers.aplace_basket_orders([order for order, _ in batch])
+            results = response.get("data", []) if isinstance(response, dict) else []
+            # a submitter may have stopped waiting, leaving its future cancelled
+            for i, (_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if i < len(results):
+                    future.set_result(results[i])
+                else:
+                    future.set_exception(ValueError(f"No basket response for order {i}: {response}"))
+        except Exception as e:
+            error = e
+        finally:
+            # never leave a submitter waiting, also when this task itself is cancelled
+            for _, future in batch:
+                if not future.done():
+                    if error is None:
+                        future.cancel()
+                    else:
+                        future.set_exception(error)
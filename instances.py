@@ -1,20 +1,24 @@
 from pathlib import Path
 import datetime
-import dill
+import pickle
 import fyersLogin
 import telegram
 
+# instances already loaded in this process, keyed by log directory
+_cache: dict[Path, tuple] = {}
+
 
 def is_current(fname: Path) -> bool:
-    # if file dose not exist, return False
-    if not Path.exists(fname):
+    # get file modification time; if file dose not exist, return False
+    try:
+        modification_time = fname.stat().st_mtime
+    except FileNotFoundError:
         return False
 
     # get today's date
     today = datetime.datetime.today().date()
 
     # get file modification date
-    modification_time = fname.stat().st_mtime
     modification_date = datetime.datetime.fromtimestamp(modification_time).date()
 
     return modification_date == today
@@ -22,29 +26,39 @@ def is_current(fname: Path) -> bool:
 
 def get_instance(logdir: Path):
     # filenames for telegram Bot and Fyers
+    logdir = Path(logdir)
     telegramBot_fname = Path.joinpath(logdir, "telegramBot.pickle")
     fyers_fname = Path.joinpath(logdir, "fyers.pickle")
 
+    # reuse this process' instances while today's pickles are in place, skipping the pickle I/O
+    if logdir in _cache and is_current(telegramBot_fname) and is_current(fyers_fname):
+        return _cache[logdir]
+
+    # start the fyers login first so it runs in the background while the telegram bot is set up
+    login = None
+    if not is_current(fyers_fname):
+        login = fyersLogin.FyersLogin(log_path=logdir)
+
     if not is_current(telegramBot_fname):
         # initiate telegram Bot instance
         telegramBot = telegram.TelegramBot(log_path=logdir)
         with open(telegramBot_fname, "wb") as file:
-            dill.dump(telegramBot, file, byref=False, recurse=True)
+            pickle.dump(telegramBot, file, protocol=pickle.HIGHEST_PROTOCOL)
     else:
         # Export telegramBot
         with open(telegramBot_fname, "rb") as file:
-            telegramBot = dill.load(file)
+            telegramBot = pickle.load(file)
 
-    if not is_current(fyers_fname):
-        # initiate fyers login instance
-        fyers = fyersLogin.FyersLogin(
-            log_path=logdir, teleBot=telegramBot
-        ).__call__()
+    if login is not None:
+        # route the remaining login messages to the bot, then wait for the fyers instance
+        login.teleBot, login.sendMessage = telegramBot, telegramBot.sendMessage
+        fyers = login()
         with open(fyers_fname, "wb") as file:
-            dill.dump(fyers, file, byref=False, recurse=True)
+            pickle.dump(fyers, file, protocol=pickle.HIGHEST_PROTOCOL)
     else:
         # Export fyers instance
         with open(fyers_fname, "rb") as file:
-            fyers = dill.load(file)
+            fyers = pickle.load(file)
 
+    _cache[logdir] = telegramBot, fyers
     return telegramBot, fyers
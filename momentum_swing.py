@@ -12,13 +12,41 @@ License: MIT
 
 import datetime
 import json
+from functools import cached_property
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import concurrent.futures
 import instances
 import utils
 
 
+def _grouped_rolling_sum(values, groups, window):
+    """
+    Rolling sum over ``window`` consecutive values within each group, from running sums.
+
+    Args:
+        values: 1-d float array, ordered so that each group is contiguous
+        groups: Group code of each value
+        window: Number of values per window
+
+    Returns:
+        ndarray: Window sums, NaN where the window is incomplete or contains a NaN
+    """
+    missing = np.isnan(values)
+    running_sum = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+    running_missing = np.concatenate(([0], np.cumsum(missing)))
+
+    out = np.full(len(values), np.nan)
+    end = np.arange(window, len(values) + 1)
+    start = end - window
+    valid = (groups[start] == groups[end - 1]) & (running_missing[end] == running_missing[start])
+    out[end[valid] - 1] = (running_sum[end] - running_sum[start])[valid]
+    return out
+
+
 class MomentumSwing:
     """
     A class implementing momentum-based swing trading strategy.
@@ -65,18 +93,24 @@ class MomentumSwing:
         self.log_dir = self._join_path("log")
         self.data_dir = self._join_path("data")
 
-        self._initiate
-
     def _join_path(self, directory: Path) -> Path:
         """Create and return a subdirectory path."""
         new_path = Path.joinpath(self.path, directory)
         Path.mkdir(new_path, exist_ok=True)
         return new_path
 
+    @cached_property
+    def _clients(self):
+        """Telegram bot and Fyers client instances, created on first use."""
+        return instances.get_instance(self.log_dir)
+
+    @property
+    def telegramBot(self):
+        return self._clients[0]
+
     @property
-    def _initiate(self):
-        """Initialize Telegram bot and Fyers client instances."""
-        self.telegramBot, self.FyersClient = instances.get_instance(self.log_dir)
+    def FyersClient(self):
+        return self._clients[1]
 
     def getSymbols(self) -> list:
         """
@@ -98,42 +132,71 @@ class MomentumSwing:
             headers=headers,
         )
 
-        # import symbol details from Fyers website
+        # import symbol details from Fyers website; only ISIN and Symbol (6th and 10th of the 19 fields) are parsed
         symbol_details = utils.read_url(
             url="https://public.fyers.in/sym_details/NSE_CM.csv",
             headers=headers,
-            columns=(
-                "Fytoken", "Symbol Details", "Exchange Instrument type",
-                "Minimum lot size", "Tick size", "ISIN", "Trading Session",
-                "Last update date", "Expiry date", "Symbol", "Exchange",
-                "Segment", "Scrip code", "Underlying scrip code",
-                "Strike price", "Option type", "Underlying FyToken",
-                "Fytoken1", "NA",
-            ),
+            columns=("ISIN", "Symbol"),
+            usecols=(5, 9),
         )
 
         #  filters for specific scrip codes
         return symbol_details[
-            symbol_details.ISIN.isin(stock_details["ISIN Code"].to_list())
+            symbol_details.ISIN.isin(pd.Index(stock_details["ISIN Code"].unique()))
         ].Symbol.to_list()
 
     @property
     def import_historical_data(self):
         """
-        Import historical price data from parquet file.
-        
+        Import historical price data from the parquet dataset.
+
+        The data is stored as a parquet dataset partitioned by symbol, one file per symbol, so
+        updates only rewrite the symbols they touch. A single-file store written by earlier
+        versions is migrated on first read.
+
         Returns:
-            tuple: (file path, historical data DataFrame)
+            tuple: (dataset directory, historical data DataFrame)
         """
-        fpath = Path.joinpath(self.data_dir, "ohlc_data.parquet.gzip")
-        try:
-            historical_data = pd.read_parquet(fpath)
-        except FileNotFoundError as e:
-            print("File not found...")
-            historical_data = pd.DataFrame()
-        except Exception as e:
-            raise e
-        return fpath, historical_data
+        dataset_dir = Path.joinpath(self.data_dir, "ohlc")
+        if not dataset_dir.exists():
+            for legacy_fpath in ("ohlc_data.parquet", "ohlc_data.parquet.gzip"):
+                legacy_fpath = Path.joinpath(self.data_dir, legacy_fpath)
+                if legacy_fpath.exists():
+                    self._write_historical_data(dataset_dir, pd.read_parquet(legacy_fpath, engine="pyarrow"))
+                    break
+            else:
+                print("File not found...")
+                return dataset_dir, pd.DataFrame()
+
+        # the symbol partition is read as a dictionary column, i.e. a pandas categorical
+        partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+        historical_data = ds.dataset(dataset_dir, format="parquet", partitioning=partitioning).to_table().to_pandas()
+        # parse dates once here; get_momentum expects a datetime64 column
+        historical_data["date"] = pd.to_datetime(historical_data["date"], format="%Y-%m-%d", cache=True)
+        return dataset_dir, historical_data
+
+    @staticmethod
+    def _write_historical_data(dataset_dir, data):
+        """
+        Write the full history of the given symbols to the dataset, one partition per symbol.
+
+        The partitions of the symbols in ``data`` are replaced; other symbols are left as they are.
+
+        Args:
+            dataset_dir: Root directory of the dataset
+            data: DataFrame holding every row of the symbols to write
+        """
+        ds.write_dataset(
+            pa.Table.from_pandas(data, preserve_index=False),
+            dataset_dir,
+            format="parquet",
+            partitioning=["symbol"],
+            partitioning_flavor="hive",
+            basename_template="part-{i}.parquet",
+            # clear each written partition first, so a symbol is always a single file
+            existing_data_behavior="delete_matching",
+            file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        )
 
     def update_historical_data(self):
         """
@@ -146,32 +209,35 @@ class MomentumSwing:
         symbols = self.getSymbols()
 
         # import stored historical data
-        fpath, historical_data = self.import_historical_data
+        dataset_dir, historical_data = self.import_historical_data
 
-        # import recent data
+        # import recent data; today is read once so every symbol sees the same date
+        today = datetime.datetime.now().date()
         data = {
             "resolution": "D",
-            "range_to": datetime.datetime.now().date(),
+            "range_to": today,
         }
 
-        hist_data = lambda symbol: historical_data[
-            historical_data["symbol"] == symbol
-        ].copy()
-        
+        # last stored date of every symbol, looked up below instead of filtering the frame per symbol
+        max_dates = (
+            historical_data.groupby("symbol", observed=True, sort=False)["date"].max().dt.date.to_dict()
+            if len(historical_data)
+            else {}
+        )
+
         input_data = []
         for symbol in symbols:
-            stock_data = hist_data(symbol)
-            if len(stock_data):
-                if stock_data.date.dt.date.max() != datetime.datetime.now().date():
+            last_date = max_dates.get(symbol)
+            if last_date is not None:
+                if last_date != today:
                     temp_data = {
                         "symbol": symbol,
-                        "range_from": stock_data.date.dt.date.max()
-                        + datetime.timedelta(days=1),
+                        "range_from": last_date + datetime.timedelta(days=1),
                     }
                 else:
                     temp_data = {
                         "symbol": symbol,
-                        "range_from": datetime.datetime.now().date(),
+                        "range_from": today,
                     }
             else:
                 print(f"No stock data available for {symbol}")
@@ -181,10 +247,24 @@ class MomentumSwing:
                 }
             input_data.append(data | temp_data)
 
-        updated_data = [self.FyersClient.history_daily(data) for data in input_data]
-        #  update the historical data file with recent data
-        historical_data = pd.concat([historical_data, *updated_data])
-        historical_data.to_parquet(fpath, compression="gzip", index=None)
+        # fetch the symbols concurrently; map keeps the results in input order
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            updated_data = list(executor.map(self.FyersClient.history_daily, input_data))
+        #  merge the recent data into the stored dataset, skipping symbols with no new candles
+        updated_data = [frame for frame in updated_data if frame is not None and len(frame)]
+        if updated_data:
+            new_data = pd.concat(updated_data, ignore_index=True)
+            # a re-fetched day (e.g. a re-run on the same day) replaces its stored row
+            historical_data = (
+                pd.concat([historical_data, new_data], ignore_index=True)
+                .drop_duplicates(["symbol", "date"], keep="last")
+                .sort_values(["symbol", "date"], ignore_index=True)
+            )
+            # rewrite only the partitions of the symbols that got new rows
+            touched = historical_data["symbol"].isin(new_data["symbol"].unique())
+            self._write_historical_data(dataset_dir, historical_data[touched])
+        if len(historical_data):
+            historical_data["symbol"] = historical_data["symbol"].astype("category")
         return historical_data
 
     def get_momentum(self, historical_data, symbol):
@@ -194,25 +274,98 @@ class MomentumSwing:
         The momentum is calculated as the 12-week rolling product of weekly returns.
         
         Args:
-            historical_data: DataFrame containing historical price data
+            historical_data: DataFrame containing historical price data, with datetime64 dates
             symbol: Stock symbol to calculate momentum for
             
         Returns:
             DataFrame: Historical data with momentum indicator
         """
         symbolData = historical_data[historical_data.symbol == symbol].copy()
-        symbolData["date"] = pd.to_datetime(symbolData["date"], format="%Y-%m-%d")
         symbolData.set_index("date", inplace=True)
         symbolData.sort_index(inplace=True)
         weekly_returns = symbolData.resample("W-FRI")["close"].last().pct_change()
-        short_term_returns = (
-            weekly_returns.rolling(window=12)
-            .apply(lambda x: (x + 1).prod() - 1)
-            .round(5)
-        )
+        # compounded 12-week return, as the rolling sum of log returns
+        short_term_returns = np.expm1(np.log1p(weekly_returns).rolling(window=12).sum()).round(5)
         symbolData["momentum"] = short_term_returns
         return symbolData
 
+    def get_momentum_all(self, historical_data):
+        """
+        Calculate the momentum indicator for every symbol in one pass.
+
+        Equivalent to concatenating ``get_momentum`` over all symbols, but buckets weeks and rolls
+        the whole frame with a single groupby instead of filtering it once per symbol.
+
+        Args:
+            historical_data: DataFrame containing historical price data, with datetime64 dates
+
+        Returns:
+            DataFrame: Historical data with momentum indicator, indexed by date
+        """
+        data = historical_data.sort_values(["symbol", "date"], kind="stable").set_index("date")
+        # label each day with the Friday closing its week (the W-FRI bins), and group on that
+        # instead of running resample
+        week_end = data.index + pd.to_timedelta((4 - data.index.dayofweek) % 7, unit="D")
+        weekly_close = data["close"].groupby([data["symbol"], week_end.rename("date")], observed=True).last()
+        log_returns = np.log1p(weekly_close.groupby(level="symbol", observed=True).pct_change())
+        # like resample, leave no return across a week without candles
+        week_gap = pd.Series(weekly_close.index.get_level_values("date")).diff()
+        log_returns[week_gap.ne(pd.Timedelta(weeks=1)).to_numpy()] = np.nan
+        momentum = _grouped_rolling_sum(log_returns.to_numpy(), log_returns.index.codes[0], window=12)
+        momentum = pd.Series(np.expm1(momentum).round(5), index=log_returns.index)
+        return data.join(momentum.rename("momentum"), on=["symbol", "date"])
+
+    def get_top_symbols(self, momentum_data):
+        """
+        Select the ``portfolio_size`` symbols with the highest latest momentum.
+
+        Uses ``np.argpartition`` to pick the top symbols in linear time, and sorts only those.
+
+        Args:
+            momentum_data: DataFrame returned by get_momentum_all
+
+        Returns:
+            DataFrame: Latest row of each selected symbol, by descending momentum
+        """
+        last_frame = momentum_data.dropna(subset="momentum").groupby("symbol", observed=True).tail(1)
+        n = min(self.portfolio_size, len(last_frame))
+        if n == 0:
+            return last_frame
+        top_idx = np.argpartition(-last_frame["momentum"].to_numpy(), n - 1)[:n]
+        return last_frame.iloc[top_idx].sort_values("momentum", ascending=False)
+
+    def save_holdings(self, holdings, date):
+        """
+        Store the holdings of a day in the holdings parquet dataset, partitioned by date.
+
+        Args:
+            holdings: List of holding records (dicts) or a DataFrame
+            date: Date the holdings belong to; an earlier save for the same date is replaced
+        """
+        pd.DataFrame(holdings).assign(date=str(date)).to_parquet(
+            Path.joinpath(self.data_dir, "holdings"),
+            engine="pyarrow",
+            partition_cols=["date"],
+            existing_data_behavior="delete_matching",
+        )
+
+    def load_holdings(self, date):
+        """
+        Load the holdings stored for a day.
+
+        Args:
+            date: Date to load the holdings of
+
+        Returns:
+            DataFrame: Holdings of that date, empty if none were saved
+        """
+        try:
+            return pd.read_parquet(
+                Path.joinpath(self.data_dir, "holdings"), engine="pyarrow", filters=[("date", "==", str(date))]
+            )
+        except FileNotFoundError:
+            return pd.DataFrame()
+
 
 if __name__ == "__main__":
     # Example usage
@@ -360,5 +513,5 @@ except FileNotFoundError:
         if values.get("rank") <= 5
     ]
     print(json.dumps(order_queue, default=str, indent=4))
-    # print(FyersClient.place_basket_orders(json.dumps(order_queue, default=str)))
+    # print(FyersClient.place_basket_orders(order_queue))
 """
@@ -1,15 +1,20 @@
 import json
-from bs4 import BeautifulSoup
-import requests
-import concurrent.futures
+import asyncio
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
 import utils
 
+aclient = utils.aclient
+
+logger = logging.getLogger(__name__)
+
 
 class UpdateSectorMap:
     """
     A class for updating sector maps from NiftyIndices website.
 
-    This class allows you to fetch sector data and store it in a JSON file.
+    This class allows you to fetch sector data and store it in a JSON file. All pages are fetched
+    on one event loop over the shared async client.
 
     Attributes:
         base_url (str): The base URL of the NiftyIndices website.
@@ -17,13 +22,13 @@ class UpdateSectorMap:
 
     Methods:
         _getResponse(url: str) -> str:
-            Fetches an HTTP response from a given URL.
+            Fetches an HTTP response from a given URL (coroutine).
 
         _mapFile(endpoint: str) -> dict:
-            Maps sector names to their corresponding URLs.
+            Maps sector names to their corresponding URLs (coroutine).
 
         _fetch_datafile(sector: str, url: str):
-            Fetches data for a specific sector and saves it to the datafile dictionary.
+            Fetches data for a specific sector and saves it to the datafile dictionary (coroutine).
 
         updateSector():
             Updates the sector map and saves it to a JSON file.
@@ -33,7 +38,13 @@ class UpdateSectorMap:
         self.base_url = "https://www.niftyindices.com"
         self.headers = {"User-Agent": "Mozilla/5.0"}
 
-    @utils.retry(max_attempts=5, initial_delay=2, backoff_factor=3)
+        # Maximum number of sector pages fetched at once
+        self.max_concurrency = 10
+
+    @utils.aretry(
+        max_attempts=5, initial_delay=2, backoff_factor=3, should_retry=utils.is_transient_http_error, max_delay=30
+    )
+    @aclient.request
     def _getResponse(self, url):
         """
         Fetches an HTTP response from a given URL.
@@ -44,15 +55,10 @@ class UpdateSectorMap:
         Returns:
             str: The response content as text.
         """
-        try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.text
-        except requests.exceptions.RequestException as e:
-            print(e)
-            raise e
-
-    def _mapFile(self, endpoint):
+        # follow niftyindices.com redirects, as requests.get did
+        return {"method": "GET", "url": url, "headers": self.headers, "follow_redirects": True}
+
+    async def _mapFile(self, endpoint):
         """
         Maps sector names to their corresponding URLs.
 
@@ -63,48 +69,61 @@ class UpdateSectorMap:
             dict: A dictionary mapping sector names to their URLs.
         """
         url = f"{self.base_url}{endpoint}"
-        response = self._getResponse(url)
+        response = await self._getResponse(url)
 
-        soup = BeautifulSoup(response, "html.parser")
+        # parse only the sector menu, with the faster lxml parser
+        soup = BeautifulSoup(response, "lxml", parse_only=SoupStrainer(class_="tabinsaidmenu"))
         links = soup.select(".tabinsaidmenu li a")
         return {
             link.get_text(): f"https://www.niftyindices.com/{link.get('href')}"
             for link in links
         }
 
-    def _fetch_datafile(self, sector, url):
+    async def _fetch_datafile(self, sector, url, semaphore):
         """
         Fetches data for a specific sector and saves it to the datafile dictionary.
 
         Args:
             sector (str): The name of the sector.
             url (str): The URL to fetch data from.
+            semaphore (asyncio.Semaphore): Limits the number of pages fetched at once.
         """
-        print(f"Fetching data for {sector} from {url}...")
-        try:
-            response = self._getResponse(url=url)
-            soup = BeautifulSoup(response, "html.parser")
-            links_with_index_constituent = soup.find_all("a", href=lambda href: href and "/IndexConstituent/" in href)
+        async with semaphore:
+            print(f"Fetching data for {sector} from {url}...")
+            response = await self._getResponse(url=url)
+
+        # build nodes only for the constituent file links
+        strainer = SoupStrainer("a", href=lambda href: href and "/IndexConstituent/" in href)
+        soup = BeautifulSoup(response, "lxml", parse_only=strainer)
+        links_with_index_constituent = soup.find_all("a")
 
-            for link in links_with_index_constituent:
-                href = link.get("href")
-                filename = href.split("/")[-1]
-                self.datafile[sector.lower()] = filename
+        for link in links_with_index_constituent:
+            href = link.get("href")
+            filename = href.split("/")[-1]
+            self.datafile[sector.lower()] = filename
 
-        except requests.exceptions.RequestException as e:
-            raise e
+    async def _updateSector(self):
+        self.datafile = {}
+        map_link = await self._mapFile(endpoint="/indices/equity/")
+
+        # a sector that keeps failing is left out of the map instead of aborting the update
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(self._fetch_datafile(sector, url, semaphore) for sector, url in map_link.items()),
+            return_exceptions=True,
+        )
+        for sector, result in zip(map_link, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to fetch sector %s, leaving it out of the map", sector, exc_info=result)
+
+    # blocking variant on the shared background loop, so it also works inside a running event loop
+    _run_update = aclient.async_run(_updateSector)
 
     def updateSector(self):
         """
         Updates the sector map and saves it to a JSON file.
         """
-        self.datafile = {}
-        map_link = self._mapFile(endpoint="/indices/equity/")
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = {executor.submit(self._fetch_datafile, sector, url): (sector, url) for sector, url in map_link.items()}
-
-            concurrent.futures.wait(futures)
+        self._run_update()
 
         with open("SectorMap.json", "w") as json_file:
             json.dump(self.datafile, json_file, indent=4)
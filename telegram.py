@@ -13,8 +13,15 @@ License: MIT
 """
 
 import os
+import json
+import asyncio
+import contextlib
 import utils as utils
 
+# the shared rest clients
+client = utils.client
+aclient = utils.aclient
+
 
 class TelegramCredentials:
     token = os.environ.get("telegram_token")
@@ -33,21 +40,56 @@ class TelegramBot(utils.ExceptionLogger):
         bot_token (str): Telegram Bot API token
         chat_id (str): Telegram chat ID where messages will be sent
         base_url (str): Base URL for Telegram Bot API
+        MAX_MESSAGE_LENGTH (int): Longest text Telegram accepts in a single message
+        MAX_MEDIA_GROUP_SIZE (int): Most photos Telegram accepts in a single album
     """
 
-    def __init__(self, log_path: str = "log"):
+    MAX_MESSAGE_LENGTH = 4096
+    MAX_MEDIA_GROUP_SIZE = 10
+
+    def __init__(self, log_path: str = "log", chat_id: str = None):
         """
         Initialize the TelegramBot instance.
         
         Args:
             log_path: Path where log files will be stored
+            chat_id: Chat ID where messages will be sent, defaults to the telegram_chat_id environment variable
         """
         utils.ExceptionLogger.__init__(self, level="DEBUG", log_path=log_path)
+        self.log_path = log_path
         self.bot_token = os.environ.get("telegram_bot_token")
-        self.chat_id = os.environ.get("telegram_chat_id")
+        self.chat_id = chat_id or os.environ.get("telegram_chat_id")
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
         os.makedirs(self.log_path, exist_ok=True)
 
+        # endpoint URLs, built once instead of on every send
+        self._send_message_url = f"{self.base_url}/sendMessage"
+        self._send_document_url = f"{self.base_url}/sendDocument"
+        self._send_photo_url = f"{self.base_url}/sendPhoto"
+        self._send_media_group_url = f"{self.base_url}/sendMediaGroup"
+
+        # pooled client shared by all bots, bound once here rather than looked up per request
+        self._client = client
+        # the bot is itself a DEBUG-level logger that does not reraise, so log through it
+        self._post = self.log_exception(self._client.post)
+
+        # messages queued by enqueueMessage, and their joined length including separators
+        self._pending = []
+        self._pending_chars = 0
+
+    def __getstate__(self):
+        # only the configuration is pickled; the logger and bot token are set up again on load
+        return {"log_path": self.log_path, "chat_id": self.chat_id}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
     @property
     def _validate_credentials(self):
         """
@@ -59,15 +101,6 @@ class TelegramBot(utils.ExceptionLogger):
         if not all([self.bot_token, self.chat_id]):
             raise ValueError("Telegram credentials not found in environment variables")
 
-    def make_request(self, func):
-        # create a looger instance
-        logger = utils.ExceptionLogger(
-            level="DEBUG", log_path=self.log_path, reraise_on_exception=False)
-        # create a HTTP request handler
-        client = utils.RestClient()
-        wrapper = logger.log_exception(client.request(func))
-        return wrapper()
-
     def sendMessage(self, text):
         """
         Send a text message via the Telegram Bot API.
@@ -80,13 +113,90 @@ class TelegramBot(utils.ExceptionLogger):
         """
         try:
             self._validate_credentials
-            inputs = {"method": "POST", "url": f"{self.base_url}/sendMessage", "params": {
-                "chat_id": self.chat_id, "text": text}}
-            return self.make_request(lambda: inputs)
+            return self._post(self._send_message_url, params={"chat_id": self.chat_id, "text": text})
         except Exception as e:
             self.logger.error(f"Failed to send Telegram message: {str(e)}")
             return None
 
+    @aclient.request
+    def _asendMessage(self, text):
+        return {"method": "POST", "url": self._send_message_url, "params": {"chat_id": self.chat_id, "text": text}}
+
+    async def asendMany(self, texts, max_concurrency=25):
+        """
+        Send several text messages concurrently via the Telegram Bot API.
+
+        At most ``max_concurrency`` requests are in flight at once, keeping well within Telegram's
+        limit of about 30 messages per second. The messages may arrive in any order.
+
+        Args:
+            texts (list): The texts of the messages.
+            max_concurrency (int, optional): The maximum number of requests in flight (default is 25).
+
+        Returns:
+            list: The API responses in the order of ``texts``, None for messages that failed.
+        """
+        self._validate_credentials
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def send(text):
+            async with semaphore:
+                return await self._asendMessage(text)
+
+        responses = await asyncio.gather(*(send(text) for text in texts), return_exceptions=True)
+        for i, response in enumerate(responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"Failed to send Telegram message: {str(response)}")
+                responses[i] = None
+        return responses
+
+    # blocking variant for synchronous callers, running asendMany on the shared background loop
+    sendMany = aclient.async_run(asendMany)
+
+    def enqueueMessage(self, text):
+        """
+        Queue a text message to be sent together with other queued messages.
+
+        Queued messages are joined with newlines into as few Telegram messages as possible. They are
+        sent when the next message would not fit, on ``flush``, or when the bot is used as a context
+        manager and the block exits. A text longer than ``MAX_MESSAGE_LENGTH`` is split into
+        several messages, at line breaks where possible.
+
+        Args:
+            text (str): The text of the message.
+        """
+        for part in self._split_text(text):
+            if self._pending and self._pending_chars + len(part) > self.MAX_MESSAGE_LENGTH:
+                self.flush()
+            self._pending.append(part)
+            self._pending_chars += len(part) + 1
+
+    def _split_text(self, text):
+        # yield pieces of at most MAX_MESSAGE_LENGTH characters, breaking at the last newline that fits
+        limit = self.MAX_MESSAGE_LENGTH
+        while len(text) > limit:
+            cut = text.rfind("\n", 0, limit + 1)
+            if cut <= 0:
+                yield text[:limit]
+                text = text[limit:]
+            else:
+                yield text[:cut]
+                text = text[cut + 1 :]
+        yield text
+
+    def flush(self):
+        """
+        Send all queued messages as a single message.
+
+        Returns:
+            dict: The API response, or None if nothing was queued.
+        """
+        if not self._pending:
+            return None
+        text = "\n".join(self._pending)
+        self._pending, self._pending_chars = [], 0
+        return self.sendMessage(text)
+
     def sendDocument(self, document_path, caption=""):
         """
         Send a document via the Telegram Bot API.
@@ -98,19 +208,17 @@ class TelegramBot(utils.ExceptionLogger):
         Returns:
             dict: The API request parameters.
         """
+        self._validate_credentials
         try:
-            self._validate_credentials
-            inputs = {
-                "method": "POST",
-                "url": f"{self.base_url}/sendDocument",
-                "params": {"chat_id": self.chat_id, "caption": caption},
-                "files": {"document": open(document_path, "rb")},
-            }
+            # httpx streams the file into the multipart body in chunks; the with closes it afterwards
+            with open(document_path, "rb") as document:
+                return self._post(
+                    self._send_document_url,
+                    params={"chat_id": self.chat_id, "caption": caption},
+                    files={"document": document},
+                )
         except FileNotFoundError as e:
             raise FileNotFoundError(f"File not found: {str(e)}")
-        except Exception as e:
-            raise e
-        return self.make_request(lambda: inputs)
 
     def sendPhoto(self, photo_path, caption=""):
         """
@@ -123,19 +231,50 @@ class TelegramBot(utils.ExceptionLogger):
         Returns:
             dict: The API request parameters.
         """
+        self._validate_credentials
         try:
-            self._validate_credentials
-            inputs = {
-                "method": "POST",
-                "url": f"{self.base_url}/sendPhoto",
-                "params": {"chat_id": self.chat_id, "caption": caption},
-                "files": {"photo": open(photo_path, "rb")},
-            }
+            with open(photo_path, "rb") as photo:
+                return self._post(
+                    self._send_photo_url,
+                    params={"chat_id": self.chat_id, "caption": caption},
+                    files={"photo": photo},
+                )
         except FileNotFoundError as e:
             raise FileNotFoundError(f"File not found: {str(e)}")
-        except Exception as e:
-            raise e
-        return self.make_request(lambda: inputs)
+
+    def sendMediaGroup(self, photo_paths, caption=""):
+        """
+        Send several photos as albums via the Telegram Bot API, one request per album of up to 10.
+
+        Args:
+            photo_paths (list): The paths to the photo files.
+            caption (str, optional): The caption, shown under the first photo of each album (default is '').
+
+        Returns:
+            list: The API responses, one per album.
+        """
+        self._validate_credentials
+        responses = []
+        for start in range(0, len(photo_paths), self.MAX_MEDIA_GROUP_SIZE):
+            group = photo_paths[start : start + self.MAX_MEDIA_GROUP_SIZE]
+            if len(group) == 1:
+                # an album needs at least two items
+                responses.append(self.sendPhoto(group[0], caption))
+                continue
+
+            media = [{"type": "photo", "media": f"attach://photo{i}"} for i in range(len(group))]
+            media[0]["caption"] = caption
+            # the stack closes every file opened so far, also when a later open fails
+            with contextlib.ExitStack() as stack:
+                files = {f"photo{i}": stack.enter_context(open(path, "rb")) for i, path in enumerate(group)}
+                responses.append(
+                    self._post(
+                        self._send_media_group_url,
+                        data={"chat_id": self.chat_id, "media": json.dumps(media)},
+                        files=files,
+                    )
+                )
+        return responses
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
-from .async_rest_client import AsyncRestClient
-from .rest_client import RestClient
+from .async_rest_client import AsyncRestClient, aclient
+from .rest_client import RestClient, client
 from .logger import ExceptionLogger
 from .measure_execution_time_decorator import MeasureExecutionTime
-from .retry_exception import retry
-from .freezeargs import freezeargs
+from .retry_exception import retry, aretry, is_transient_http_error
+from .hashable_lru_cache import hashable_lru_cache
+from .disk_cache import disk_cache
 from .read_url import read_url
@@ -1,27 +1,94 @@
-import json
+import atexit
 import httpx
+import orjson
 import asyncio
+import inspect
+import weakref
+import threading
 from functools import wraps
 
+from .rest_client import POOL_LIMITS, encode_json_body
+
+# event loop shared by every async_run call, running on a daemon thread once started
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    """
+    Return the shared background event loop, starting its thread on first use.
+
+    Returns:
+        asyncio.AbstractEventLoop: The running background loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="AsyncRestClient-loop", daemon=True).start()
+    return _loop
+
 
 class AsyncRestClient:
     """
     A class for making HTTP requests with error handling and JSON parsing.
 
+    Requests are sent through a pooled HTTP/2 ``httpx.AsyncClient`` so that concurrent
+    calls multiplex over shared keep-alive connections.
+
     Attributes:
-        VALID_METHODS (list): A list of valid HTTP methods supported by this client.
+        VALID_METHODS (frozenset): The valid HTTP methods supported by this client.
     """
 
-    VALID_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS", "CONNECT", "TRACE"]
+    VALID_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS", "CONNECT", "TRACE"})
 
-    def __init__(self, timeout=5):
+    def __init__(self, timeout=5, limits=POOL_LIMITS):
         """
         Initialize the RestClient.
 
         Args:
             timeout (int, optional): Timeout for HTTP requests in seconds. Defaults to 5 seconds.
+            limits (httpx.Limits, optional): Connection pool limits. Defaults to POOL_LIMITS, sized for
+                market-open bursts (100 connections, 40 kept alive for 30 seconds).
         """
         self.timeout = timeout
+        self.limits = limits
+        self._clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+        atexit.register(self._close_background_client)
+
+    def _close_background_client(self):
+        """
+        Close the client used by async_run on the shared background loop.
+        """
+        if _loop is not None and _loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.aclose(), _loop).result(timeout=5)
+
+    def _get_client(self):
+        """
+        Return the pooled AsyncClient bound to the running event loop.
+
+        An ``httpx.AsyncClient`` cannot be shared across event loops, so one is kept per
+        loop (e.g. one per thread running ``asyncio.run``) and dropped with its loop.
+
+        Returns:
+            httpx.AsyncClient: The client for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=True)
+        return client
+
+    async def aclose(self):
+        """
+        Close the client bound to the running event loop, if one was created.
+
+        Call this before the loop ends (e.g. in a ``finally`` inside the coroutine passed to
+        ``asyncio.run``) so its pooled connections are shut down cleanly.
+        """
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
 
     def validate_method(self, method):
         """
@@ -37,9 +104,23 @@ class AsyncRestClient:
             raise ValueError(f"Invalid method: {method}")
 
     def async_run(self, func):
+        """
+        Decorator that runs a coroutine function to completion from synchronous code.
+
+        Coroutines are submitted to one long-lived event loop on a background thread, instead of
+        building and tearing down a loop per call, so the loop's pooled client and its keep-alive
+        connections are reused across calls. Must not be called from that loop itself.
+
+        Args:
+            func (callable): The coroutine function to run.
+
+        Returns:
+            callable: A blocking function returning the coroutine's result.
+        """
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            data = asyncio.run(func(*args, **kwargs))
+            data = asyncio.run_coroutine_threadsafe(func(*args, **kwargs), _background_loop()).result()
             return data
 
         return wrapper
@@ -50,6 +131,7 @@ class AsyncRestClient:
 
         Args:
             func (callable): The function to be decorated, representing the HTTP request parameters.
+                Both coroutine functions and plain functions returning the parameters are accepted.
 
         Returns:
             callable: The decorated function.
@@ -61,21 +143,23 @@ class AsyncRestClient:
 
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            input_data = await func(*args, **kwargs)
+            input_data = func(*args, **kwargs)
+            if inspect.isawaitable(input_data):
+                input_data = await input_data
             method = input_data.get("method", "GET")
+            encode_json_body(input_data)
 
             try:
                 self.validate_method(method)
-                async with httpx.AsyncClient() as client:
-                    response = await client.request(timeout=self.timeout, **input_data)
-                    response.raise_for_status()  # Raise an HTTPError for bad status codes
+                response = await self._get_client().request(**input_data)
+                response.raise_for_status()  # Raise an HTTPError for bad status codes
+                try:
+                    data = orjson.loads(response.content)  # Try to parse the response data into a JSON object
+                except orjson.JSONDecodeError as e:
                     try:
-                        data = response.json()  # Try to parse the response data into a JSON object
-                    except json.JSONDecodeError as e:
-                        try:
-                            data = response.text  # Try to parse the response data into a text object
-                        except:
-                            raise ValueError(f"Failed to parse response JSON: {str(e)}")
+                        data = response.text  # Try to parse the response data into a text object
+                    except:
+                        raise ValueError(f"Failed to parse response JSON: {str(e)}")
                 return data
             except httpx.RequestError as e:
                 raise  # Re-raise the original exception
@@ -83,6 +167,10 @@ class AsyncRestClient:
         return wrapper
 
 
+# the process-wide async client, shared like rest_client.client
+aclient = AsyncRestClient()
+
+
 # Example usage:
 if __name__ == "__main__":
     a = AsyncRestClient()
@@ -0,0 +1,52 @@
+import os
+import time
+import hashlib
+import tempfile
+import pandas as pd
+from pathlib import Path
+from functools import wraps
+
+
+def disk_cache(ttl_hours=24, cache_dir="cache"):
+    """
+    Cache the DataFrame returned by a function in a parquet file on disk.
+
+    The file name is derived from the function name and a hash of its arguments, so the cache is
+    shared between processes and survives restarts. Entries older than ``ttl_hours`` are refetched.
+
+    Args:
+        ttl_hours (float, optional): Maximum age of a cached entry in hours (default is 24).
+        cache_dir (str, optional): Directory holding the cached files (default is "cache").
+
+    Returns:
+        callable: A decorator that can be applied to functions returning a DataFrame.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            key = hashlib.sha1(repr((args, sorted(kwargs.items()))).encode()).hexdigest()
+            path = Path(cache_dir) / f"{func.__name__}_{key}.parquet"
+            try:
+                if time.time() - path.stat().st_mtime < ttl_hours * 60 * 60:
+                    return pd.read_parquet(path)
+            except FileNotFoundError:
+                pass
+
+            data = func(*args, **kwargs)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write to a private temporary file and rename it, so other processes and threads never
+            # read a partial file; it is removed if the write fails
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+                tmp_path = tmp.name
+            try:
+                data.to_parquet(tmp_path, compression="zstd", index=False)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return data
+
+        return wrapped
+
+    return decorator
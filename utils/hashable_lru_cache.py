@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+
+def _freeze(value):
+    # dicts become sorted item tuples and lists become tuples, so they can be part of a key
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def hashable_lru_cache(maxsize: int = 128):
+    """
+    LRU cache decorator that also accepts dict and list arguments.
+
+    The arguments are turned into a plain tuple key, so no immutable copies of them are allocated
+    and the original arguments are passed on to the function on a miss.
+
+    Args:
+        maxsize (int, optional): The maximum number of cached results (default is 128).
+
+    Returns:
+        callable: A decorator that can be applied to functions.
+    """
+
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            key = (_freeze(args), _freeze(kwargs))
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+
+            result = func(*args, **kwargs)
+            with lock:
+                cache[key] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        wrapped.cache_clear = cache.clear
+        return wrapped
+
+    return decorator
@@ -1,10 +1,12 @@
 import logging
 import os
 import datetime
-import threading
-import traceback
 from logging.handlers import RotatingFileHandler
-from typing import Optional
+from typing import Any, Callable, Optional
+
+# shared by every file handler
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
 
 class ExceptionLogger:
     """
@@ -22,7 +24,7 @@ class ExceptionLogger:
 
     VALID_LOG_LEVELS = {'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'}
 
-    def __init__(self, logger_name: Optional[str] =None, level:str ='INFO', log_path:str ='log', reraise_on_exception:bool =False):
+    def __init__(self, logger_name: Optional[str] = None, level: str = 'INFO', log_path: str = 'log', reraise_on_exception: bool = False) -> None:
         """
         Initializes an instance of ExceptionLogger.
 
@@ -32,12 +34,11 @@ class ExceptionLogger:
             log_path (str, optional): The log_path directory. Defaults to 'log'.
             reraise_on_exception (bool, optional): Whether to reraise exceptions. Defaults to False.
         """
-        self.logger = None
-        self.lock = threading.Lock()
+        self.logger: logging.Logger
         self.set_logger(logger_name, level, log_path)
         self.reraise_on_exception = reraise_on_exception
 
-    def set_logger(self, logger_name, level, root):
+    def set_logger(self, logger_name: Optional[str], level: str, root: str) -> None:
         """
         Sets the logger with the specified name, log level, and root directory.
 
@@ -54,7 +55,7 @@ class ExceptionLogger:
 
         self.logger = self.setup_logger(logger_name, level, root)
 
-    def setup_logger(self, logger_name, level, root):
+    def setup_logger(self, logger_name: Optional[str], level: str, root: str) -> logging.Logger:
         """
         Configures the logger with the specified name, log level, and root directory.
 
@@ -73,18 +74,20 @@ class ExceptionLogger:
         logger = logging.getLogger(logger_name)
         logger.setLevel(level)
 
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        # loggers are process-wide singletons; configure the file handler only once per log file
+        if any(isinstance(handler, RotatingFileHandler) for handler in logger.handlers):
+            return logger
 
-        # Use RotatingFileHandler to rotate and compress log files
-        file_handler = RotatingFileHandler(logger_name, maxBytes=1024*1024, backupCount=5)
+        # Use RotatingFileHandler to rotate and compress log files; the file is opened on the first record
+        file_handler = RotatingFileHandler(logger_name, maxBytes=1024*1024, backupCount=5, delay=True)
         file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_FORMATTER)
 
         logger.addHandler(file_handler)
 
         return logger
 
-    def log_exception(self, func):
+    def log_exception(self, func: Callable[..., Any]) -> Callable[..., Any]:
         """
         Decorator method that logs exceptions raised in the decorated function with the logger.
 
@@ -94,17 +97,18 @@ class ExceptionLogger:
         Returns:
             function: The decorated function.
         """
-        def wrapper(*args, **kwargs):
-            with self.lock:
-                try:
-                    result = func(*args, **kwargs)
-                    return result
-                except Exception as e:
-                    traceback_str = traceback.format_exc()
-                    self.logger.error(f'Exception raised in {func.__name__}. Traceback:\n{traceback_str}')
-                    if self.reraise_on_exception:
-                        raise e
-                    return None
+        # no lock here: handlers serialize their own writes, and holding one around func would
+        # serialize every decorated call
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                result = func(*args, **kwargs)
+                return result
+            except Exception as e:
+                # exc_info defers formatting the traceback until a handler emits the record
+                self.logger.error('Exception raised in %s. Traceback:', func.__name__, exc_info=True)
+                if self.reraise_on_exception:
+                    raise e
+                return None
         return wrapper
 
 
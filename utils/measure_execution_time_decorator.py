@@ -1,6 +1,6 @@
 import time
+import statistics
 from functools import wraps
-import numpy as np
 
 
 def MeasureExecutionTime(repeat: int = 1):
@@ -22,10 +22,14 @@ def MeasureExecutionTime(repeat: int = 1):
                 start_time = time.perf_counter()
                 result = func(*args, **kwargs)
                 end_time = time.perf_counter()
-                total_times.append(round(end_time - start_time, 2))
+                total_times.append(end_time - start_time)
 
-            mean_time = np.mean(total_times)
-            std_deviation = np.std(total_times)
+            if repeat == 1:
+                print(f"Time: {total_times[0]:.2f} seconds")
+                return result
+
+            mean_time = statistics.fmean(total_times)
+            std_deviation = statistics.pstdev(total_times)
             print(f"Mean time: {mean_time:.2f} ± {std_deviation:.2f} seconds")
             return result
 
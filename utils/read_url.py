@@ -1,31 +1,42 @@
-import io
+import atexit
 import pandas as pd
 import requests
-from functools import lru_cache
+from requests.adapters import HTTPAdapter
 import utils
 
+# shared session, so repeated downloads reuse the same keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+atexit.register(_SESSION.close)
 
-@utils.freezeargs
-@lru_cache(maxsize=10)
-def read_url(url, headers=None, columns=None):
+
+@utils.hashable_lru_cache(maxsize=10)
+@utils.disk_cache(ttl_hours=24)
+def read_url(url, headers=None, columns=None, usecols=None):
     """
     Fetches data from a URL and returns the response content as JSON.
 
+    Results are cached in memory and on disk for a day, as the files read here change at most daily.
+
     Args:
         url (str): The URL to fetch data from.
         headers (dict, optional): Headers to include in the HTTP request (default is None).
         columns (list, optional): List of column names for the DataFrame (default is None).
+        usecols (tuple, optional): Positions of the columns to parse; the rest are skipped (default is None, all columns).
 
     Returns:
         pd.DataFrame: The DataFrame containing the data from the CSV response, or None if the request fails or parsing fails.
     """
     try:
-        # Send an HTTP GET request to the URL with optional headers
-        response = requests.get(url, headers=headers)
+        # Send an HTTP GET request to the URL with optional headers, streaming the body
+        with _SESSION.get(url, headers=headers, stream=True) as response:
+            # Raise an HTTPError for bad status codes
+            response.raise_for_status()
 
-        # Raise an HTTPError for bad status codes
-        response.raise_for_status()
+            # let urllib3 undo the content encoding while pandas reads the socket
+            response.raw.decode_content = True
 
-        return pd.read_csv(io.StringIO(response.text), names=columns)
+            # parse the stream block by block with the multithreaded pyarrow reader, never holding the whole body
+            return pd.read_csv(response.raw, names=columns, usecols=usecols, engine="pyarrow")
     except requests.exceptions.RequestException as e:
         raise e  # Re-raise the original exception
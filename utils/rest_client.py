@@ -1,7 +1,29 @@
-import json
-import requests
+import atexit
+import logging
+import threading
+import httpx
+import orjson
 
 from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+# Connection pool limits shared by the sync and async clients
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30)
+
+logger = logging.getLogger(__name__)
+
+
+def encode_json_body(input_data: Dict[str, Any]) -> None:
+    """
+    Serialize a "json" request payload with orjson, which emits bytes directly and is considerably
+    faster than the stdlib encoder httpx would otherwise use.
+
+    Args:
+        input_data (dict): The request parameters; updated in place.
+    """
+    if "json" in input_data:
+        input_data["content"] = orjson.dumps(input_data.pop("json"))
+        input_data["headers"] = {**(input_data.get("headers") or {}), "Content-Type": "application/json"}
 
 
 class RestClient:
@@ -9,22 +31,87 @@ class RestClient:
     """
     A class for making HTTP requests with error handling and JSON parsing.
 
+    Requests are sent through a single pooled ``httpx.Client`` so that keep-alive
+    connections (and their TLS sessions) are reused across calls. HTTP/2 is enabled,
+    letting independent requests to the same host multiplex over one connection.
+    The client is thread-safe, so a single instance can be shared by worker threads
+    (e.g. a strategy loop and a Telegram callback) without per-thread sessions.
+
     Attributes:
-        VALID_METHODS (list): A list of valid HTTP methods supported by this client.
+        VALID_METHODS (frozenset): The valid HTTP methods supported by this client.
     """
 
-    VALID_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS", "CONNECT", "TRACE"]
+    VALID_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS", "CONNECT", "TRACE"})
 
-    def __init__(self, timeout=5):
+    def __init__(self, timeout: float = 5, limits: httpx.Limits = POOL_LIMITS) -> None:
         """
         Initialize the RestClient.
 
         Args:
             timeout (int, optional): Timeout for HTTP requests in seconds. Defaults to 5 seconds.
+            limits (httpx.Limits, optional): Connection pool limits. Defaults to POOL_LIMITS, sized for
+                market-open bursts (100 connections, 40 kept alive for 30 seconds).
         """
         self.timeout = timeout
+        self.limits = limits
+        self._session = httpx.Client(
+            limits=self.limits,
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            http2=True,
+            follow_redirects=True,  # as requests did
+        )
+        self._http_version_logged = False
+        self._closed = threading.Event()
+        self._pingers: Dict[str, threading.Event] = {}  # url -> stop event of its keep-alive thread
+        self._pingers_lock = threading.Lock()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """
+        Stop any keep-alive pings and close the underlying connection pool.
+        """
+        self._closed.set()
+        with self._pingers_lock:
+            for stop in self._pingers.values():
+                stop.set()
+        self._session.close()
 
-    def validate_method(self, method):
+    def keep_alive(self, url: str, headers: Optional[Dict[str, str]] = None, interval: float = 25) -> threading.Event:
+        """
+        Periodically ping a URL on a daemon thread so idle pooled connections are not torn down.
+
+        At most one thread pings each URL: calling this again for the same URL stops the previous
+        thread and starts one with the new headers and interval.
+
+        Args:
+            url (str): The URL to ping.
+            headers (dict, optional): Headers to include in the ping request.
+            interval (float, optional): Seconds between pings. Should stay below the pool's keep-alive expiry.
+
+        Returns:
+            threading.Event: Set it to stop the pings.
+        """
+        stop = threading.Event()
+
+        def ping() -> None:
+            while not stop.wait(interval):
+                try:
+                    self._session.get(url, headers=headers, timeout=2)
+                except httpx.HTTPError as e:
+                    logger.debug("Keep-alive ping to %s failed: %s", url, e)
+
+        with self._pingers_lock:
+            if self._closed.is_set():
+                stop.set()
+                return stop
+            previous = self._pingers.get(url)
+            if previous is not None:
+                previous.set()
+            self._pingers[url] = stop
+        threading.Thread(target=ping, name="RestClient-keep-alive", daemon=True).start()
+        return stop
+
+    def validate_method(self, method: str) -> None:
         """
         Validate that the HTTP method is one of the valid methods.
 
@@ -37,42 +124,84 @@ class RestClient:
         if method.upper() not in self.VALID_METHODS:
             raise ValueError(f"Invalid method: {method}")
 
-    def request(self, func):
+    def execute(self, input_data: Dict[str, Any]) -> Any:
+        """
+        Send an HTTP request described by a dict of request parameters, with error handling and JSON parsing.
+
+        Args:
+            input_data (dict): The request parameters, e.g. "method", "url", "params", "json" or "files".
+                Updated in place.
+
+        Returns:
+            dict | str: The parsed JSON response, or the response text if it is not JSON.
+
+        Raises:
+            httpx.HTTPError: If the HTTP request encounters an exception.
+            ValueError: If the method is not valid or there is a JSON parsing error in the response.
+        """
+        method = input_data.pop("method", "GET")
+        self.validate_method(method)
+        return self._send(method, input_data)
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        """
+        Send a GET request; see ``execute`` for the keyword arguments, response and errors.
+        """
+        kwargs["url"] = url
+        return self._send("GET", kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        """
+        Send a POST request; see ``execute`` for the keyword arguments, response and errors.
+        """
+        kwargs["url"] = url
+        return self._send("POST", kwargs)
+
+    def _send(self, method: str, input_data: Dict[str, Any]) -> Any:
+        # method is already known to be valid here
+        encode_json_body(input_data)
+
+        try:
+            response = self._session.request(method, **input_data)
+            if not self._http_version_logged:
+                logger.debug("Negotiated %s with %s", response.http_version, response.url.host)
+                self._http_version_logged = True
+            response.raise_for_status()  # Raise an HTTPError for bad status codes
+            try:
+                data = orjson.loads(response.content)  # Try to parse the response data into a JSON object
+            except orjson.JSONDecodeError as e:
+                try:
+                    data = response.text  # Try to parse the response data into a text object
+                except:
+                    raise ValueError(f"Failed to parse response JSON: {str(e)}")
+
+            return data
+        except httpx.HTTPError as e:
+            raise  # Re-raise the original exception
+        except ValueError as e:
+            raise  # Re-raise the original exception
+
+    def request(self, func: Callable[..., Dict[str, Any]]) -> Callable[..., Any]:
         """
         Decorator for making HTTP requests with error handling and JSON parsing.
 
         Args:
-            func (callable): The function to be decorated, representing the HTTP request parameters.
+            func (callable): The function to be decorated, returning the HTTP request parameters for ``execute``.
 
         Returns:
             callable: The decorated function.
 
         Raises:
-            requests.exceptions.RequestException: If the HTTP request encounters an exception.
+            httpx.HTTPError: If the HTTP request encounters an exception.
             ValueError: If there is a JSON parsing error in the response.
         """
 
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            input_data = func(*args, **kwargs)
-            method = input_data.pop("method", "GET")
-
-            try:
-                self.validate_method(method)
-                response = requests.request(method, timeout=self.timeout, **input_data)
-                response.raise_for_status()  # Raise an HTTPError for bad status codes
-                try:
-                    data = response.json()  # Try to parse the response data into a JSON object
-                except json.JSONDecodeError as e:
-                    try:
-                        data = response.text  # Try to parse the response data into a text object
-                    except:
-                        raise ValueError(f"Failed to parse response JSON: {str(e)}")
-
-                return data
-            except requests.exceptions.RequestException as e:
-                raise  # Re-raise the original exception
-            except ValueError as e:
-                raise  # Re-raise the original exception
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self.execute(func(*args, **kwargs))
 
         return wrapper
+
+
+# the process-wide client; modules share it so requests to a host reuse one pool of connections
+client = RestClient()
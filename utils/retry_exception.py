@@ -1,22 +1,42 @@
 import time
+import random
+import asyncio
+import httpx
 from functools import wraps
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type
 
 
-def retry(max_attempts=3, initial_delay=3, backoff_factor=2, do_print: bool = True):
+def is_transient_http_error(error: Exception) -> bool:
     """
-    Retry decorator with exponential backoff on exception.
+    Check whether an exception is a network failure, a 429 or a 5xx response, which are worth retrying.
 
     Args:
-        max_attempts (int, optional): The maximum number of retry attempts (default is 3).
-        initial_delay (float, optional): The initial delay in seconds between retries (default is 3).
-        backoff_factor (float, optional): The factor by which the delay should lengthen after each failure (default is 2).
-
-    Raises:
-        ValueError: If backoff_factor is not greater than 1, max_attempts is negative, or initial_delay is not greater than 0.
+        error (Exception): The exception raised by the request.
 
     Returns:
-        callable: A decorator that can be applied to functions.
+        bool: True for transport errors, rate limiting and server errors, False otherwise (e.g. other 4xx responses).
     """
+    if isinstance(error, httpx.TransportError):
+        return True
+    if not isinstance(error, httpx.HTTPStatusError):
+        return False
+    status_code = error.response.status_code
+    return status_code == 429 or 500 <= status_code < 600
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    # seconds a 429 response asked us to wait, if it said so
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+        try:
+            return float(error.response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _check_arguments(
+    max_attempts: int, initial_delay: float, backoff_factor: float, jitter: float, max_delay: Optional[float]
+) -> int:
     if backoff_factor <= 1:
         raise ValueError("backoff_factor must be greater than 1")
 
@@ -27,23 +47,126 @@ def retry(max_attempts=3, initial_delay=3, backoff_factor=2, do_print: bool = Tr
     if initial_delay <= 0:
         raise ValueError("initial_delay must be greater than 0")
 
-    def retry_decorator(func):
+    if jitter < 0:
+        raise ValueError("jitter must be 0 or greater")
+
+    if max_delay is not None and max_delay < initial_delay:
+        raise ValueError("max_delay must not be less than initial_delay")
+
+    return max_attempts
+
+
+def _wait_time(error: BaseException, current_delay: float, jitter: float, max_delay: Optional[float]) -> float:
+    # honour Retry-After on rate limiting, up to max_delay, otherwise back off with random jitter
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        return retry_after if max_delay is None else min(retry_after, max_delay)
+    return current_delay + random.uniform(0, jitter)
+
+
+def _next_delay(current_delay: float, backoff_factor: float, max_delay: Optional[float]) -> float:
+    current_delay *= backoff_factor  # Make future wait longer
+    return current_delay if max_delay is None else min(current_delay, max_delay)
+
+
+def retry(
+    max_attempts: int = 3,
+    initial_delay: float = 3,
+    backoff_factor: float = 2,
+    do_print: bool = True,
+    should_retry: Optional[Callable[[BaseException], bool]] = None,
+    jitter: float = 0,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    max_delay: Optional[float] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Retry decorator with exponential backoff on exception.
+
+    Args:
+        max_attempts (int, optional): The maximum number of retry attempts (default is 3).
+        initial_delay (float, optional): The initial delay in seconds between retries (default is 3).
+        backoff_factor (float, optional): The factor by which the delay should lengthen after each failure (default is 2).
+        should_retry (callable, optional): Predicate called with the raised exception; if it returns False the
+            exception is re-raised immediately instead of retried (default is None, retry on every exception).
+        jitter (float, optional): Upper bound in seconds of a random delay added to each wait (default is 0).
+        exceptions (tuple, optional): Exception types that are retried; any other exception propagates
+            immediately (default is (Exception,)).
+        max_delay (float, optional): Upper bound in seconds of the backoff delay (default is None, unbounded).
+
+    A 429 response carrying a ``Retry-After`` header is waited out for that long instead of the backoff delay, but
+    no longer than ``max_delay``.
+
+    Raises:
+        ValueError: If backoff_factor is not greater than 1, max_attempts is negative, initial_delay is not greater than 0,
+            jitter is negative or max_delay is less than initial_delay.
+
+    Returns:
+        callable: A decorator that can be applied to functions.
+    """
+    max_attempts = _check_arguments(max_attempts, initial_delay, backoff_factor, jitter, max_delay)
+
+    def retry_decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
-        def wrapped_function(*args, **kwargs):
+        def wrapped_function(*args: Any, **kwargs: Any) -> Any:
             remaining_attempts, current_delay = max_attempts, initial_delay  # make mutable
 
             while remaining_attempts > 0:
                 try:
                     result = func(*args, **kwargs)  # First attempt
                     return result
-                except Exception as error:
+                except exceptions as error:
                     remaining_attempts -= 1  # Consume an attempt
-                    time.sleep(current_delay)  # Wait...
-                    current_delay *= backoff_factor  # Make future wait longer
+                    if remaining_attempts <= 0 or (should_retry is not None and not should_retry(error)):
+                        raise error
                     if do_print:
                         print(f"Error occurred while executing {func.__name__}. \nRetrying ...")
-                    if remaining_attempts <= 0:
+                    time.sleep(_wait_time(error, current_delay, jitter, max_delay))  # Wait...
+                    current_delay = _next_delay(current_delay, backoff_factor, max_delay)
+
+            raise Exception(f"Failed to execute {func.__name__} after {max_attempts} attempts. ")
+
+        return wrapped_function
+
+    return retry_decorator
+
+
+def aretry(
+    max_attempts: int = 3,
+    initial_delay: float = 3,
+    backoff_factor: float = 2,
+    do_print: bool = True,
+    should_retry: Optional[Callable[[BaseException], bool]] = None,
+    jitter: float = 0,
+    exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+    max_delay: Optional[float] = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """
+    Retry decorator for coroutine functions, with exponential backoff on exception.
+
+    Takes the same arguments as ``retry``, but waits with ``asyncio.sleep`` so other tasks on the
+    event loop keep running between attempts.
+
+    Returns:
+        callable: A decorator that can be applied to coroutine functions.
+    """
+    max_attempts = _check_arguments(max_attempts, initial_delay, backoff_factor, jitter, max_delay)
+
+    def retry_decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @wraps(func)
+        async def wrapped_function(*args: Any, **kwargs: Any) -> Any:
+            remaining_attempts, current_delay = max_attempts, initial_delay  # make mutable
+
+            while remaining_attempts > 0:
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as error:
+                    remaining_attempts -= 1  # Consume an attempt
+                    if remaining_attempts <= 0 or (should_retry is not None and not should_retry(error)):
                         raise error
+                    if do_print:
+                        print(f"Error occurred while executing {func.__name__}. \nRetrying ...")
+                    await asyncio.sleep(_wait_time(error, current_delay, jitter, max_delay))  # Wait...
+                    current_delay = _next_delay(current_delay, backoff_factor, max_delay)
 
             raise Exception(f"Failed to execute {func.__name__} after {max_attempts} attempts. ")
 